@@ -0,0 +1,159 @@
+# Stratoview Lombardia - Content Archival Command
+# Place in <app>/management/commands/archive_content.py
+# Usage: python manage.py archive_content [--days N] [--batch-size N] [--dry-run] [--restore ID ...]
+
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ...models import Content, content_year_partition_sql
+
+class Command(BaseCommand):
+    help = "Move stale private content into the cold Content partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help="Archive private content not modified for this many days "
+                 "(default: archive_after_days setting, or 365)"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Number of content items moved per transaction (default: 500)"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report how many items would be archived without moving them"
+        )
+        parser.add_argument(
+            '--restore',
+            nargs='+',
+            metavar='ID',
+            help="Move the given archived content back to the hot partitions"
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] <= 0:
+            raise CommandError("--days must be a positive number of days")
+        if options['batch_size'] <= 0:
+            raise CommandError("--batch-size must be a positive number")
+
+        if options['restore']:
+            self.restore(options['restore'])
+            return
+
+        if options['dry_run']:
+            stale = Content.objects.stale_private(options['days'])
+            self.stdout.write(f"{stale.count()} content item(s) would be archived")
+            return
+
+        self.ensure_year_partitions()
+
+        archived = 0
+        while True:
+            # Short transactions keep row locks and partition moves bounded
+            with transaction.atomic():
+                batch = list(
+                    Content.objects.stale_private(options['days'])
+                    .order_by('pk')
+                    .values_list('pk', flat=True)[:options['batch_size']]
+                )
+                if not batch:
+                    break
+                archived += Content.objects.filter(pk__in=batch).archive_stale_private(options['days'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} content item(s)"))
+
+    def restore(self, raw_ids):
+        """Restore archived content by id, reporting ids that were not restored"""
+        try:
+            ids = {uuid.UUID(raw_id) for raw_id in raw_ids}
+        except ValueError as e:
+            raise CommandError(f"Invalid content id: {e}")
+
+        with transaction.atomic():
+            archived = set(Content.objects.cold().filter(id__in=ids).values_list('id', flat=True))
+            Content.objects.filter(id__in=archived).restore()
+
+        self.stdout.write(self.style.SUCCESS(f"Restored {len(archived)} content item(s)"))
+        for content_id in sorted(ids - archived, key=str):
+            self.stderr.write(self.style.WARNING(f"Not restored (missing or not archived): {content_id}"))
+
+    def ensure_year_partitions(self):
+        """Create every missing data_creazione partition up to next year.
+
+        The layout is read from the database rather than from settings, so the
+        step is skipped unless Content is actually range-partitioned on
+        data_creazione with a DEFAULT partition. Each year is handled in its
+        own transaction, separate from the archival.
+
+        Creating a partition takes an ACCESS EXCLUSIVE lock on Content. If
+        DEFAULT already holds rows for a missing year, DEFAULT is detached and
+        those rows are moved while the lock is held, blocking every Content
+        read and write until the year has moved. Running this command at
+        least yearly keeps the current and next year pre-created, so DEFAULT
+        stays empty and this slow path is never taken.
+        """
+        table = Content._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT p.partstrat, a.attname, to_regclass(%s) IS NOT NULL '
+                'FROM pg_partitioned_table p '
+                'JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] '
+                'WHERE p.partrelid = to_regclass(%s)',
+                [f'{table}_default', table],
+            )
+            layout = cursor.fetchone()
+            if layout != ('r', 'data_creazione', True):
+                return
+
+            # Continue from the oldest existing year partition
+            cursor.execute(
+                'SELECT c.relname FROM pg_inherits i '
+                'JOIN pg_class c ON c.oid = i.inhrelid '
+                'WHERE i.inhparent = to_regclass(%s) AND c.relname LIKE %s',
+                [table, f'{table}_y%'],
+            )
+            suffixes = [name[len(table) + 2:] for (name,) in cursor.fetchall()]
+            years = [int(suffix) for suffix in suffixes if suffix.isdigit()]
+
+        current_year = timezone.now().year
+        first_year = min(years, default=current_year)
+        for year in range(first_year, current_year + 2):
+            if year in years:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                bounds = [f'{year}-01-01', f'{year + 1}-01-01']
+                cursor.execute(
+                    f'SELECT EXISTS (SELECT 1 FROM {table}_default '
+                    f'WHERE data_creazione >= %s AND data_creazione < %s)',
+                    bounds,
+                )
+                if not cursor.fetchone()[0]:
+                    for statement in content_year_partition_sql(year):
+                        cursor.execute(statement)
+                else:
+                    # The DEFAULT partition must not hold rows of a new partition's range
+                    cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {table}_default')
+                    for statement in content_year_partition_sql(year):
+                        cursor.execute(statement)
+                    cursor.execute(
+                        f'INSERT INTO {table} SELECT * FROM {table}_default '
+                        f'WHERE data_creazione >= %s AND data_creazione < %s',
+                        bounds,
+                    )
+                    cursor.execute(
+                        f'DELETE FROM {table}_default '
+                        f'WHERE data_creazione >= %s AND data_creazione < %s',
+                        bounds,
+                    )
+                    cursor.execute(f'ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT')
+                    self.stderr.write(self.style.WARNING(
+                        f"Moved {year} rows out of {table}_default while holding a table lock"
+                    ))
+            self.stdout.write(f"Created partition {table}_y{year}")
@@ -4,7 +4,7 @@
 
 import uuid
 from datetime import date, timedelta
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import (
     MinLengthValidator, MaxLengthValidator, RegexValidator,
@@ -13,6 +13,7 @@ from django.core.validators import (
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
+from django.conf import settings
 import json
 
 # ================================
@@ -179,6 +180,51 @@ class User(AbstractUser):
 # CONTENT MANAGEMENT
 # ================================
 
+# Optional Postgres declarative partitioning of the Content table.
+# Example settings.py entry:
+#   STRATOVIEW_CONTENT_PARTITIONING = {
+#       'strategy': 'content_type',   # or 'data_creazione'
+#       'first_year': 2020,           # 'data_creazione' strategy only
+#       'cold_tablespace': 'cold',    # optional, tablespace for archived rows
+#       'archive_after_days': 365,
+#   }
+CONTENT_PARTITIONING = getattr(settings, 'STRATOVIEW_CONTENT_PARTITIONING', None)
+CONTENT_PARTITION_STRATEGIES = ['content_type', 'data_creazione']
+
+class ContentQuerySet(models.QuerySet):
+    """Content queries split by storage tier (hot/cold partitions)"""
+    
+    def hot(self):
+        """Working set: filtering on is_archived enables partition pruning"""
+        return self.filter(is_archived=False)
+    
+    def cold(self):
+        return self.filter(is_archived=True)
+    
+    def stale_private(self, days=None):
+        """Private content not modified in `days` days and not in an active project"""
+        if days is None:
+            days = (CONTENT_PARTITIONING or {}).get('archive_after_days', 365)
+        cutoff = timezone.now() - timedelta(days=days)
+        return (
+            self.hot()
+            .filter(visibility='private', ultima_modifica__lt=cutoff)
+            .exclude(contentblocks__is_active=True)
+        )
+    
+    def archive_stale_private(self, days=None):
+        """Move stale private content to the cold partitions.
+        
+        Updating the partition key makes Postgres move each row into the
+        matching cold partition. QuerySet.update() leaves ultima_modifica
+        untouched, so archived content keeps its real modification date.
+        """
+        return self.stale_private(days).update(is_archived=True, archived_at=timezone.now())
+    
+    def restore(self):
+        """Move archived content back to the hot partitions"""
+        return self.cold().update(is_archived=False, archived_at=None)
+
 class Content(models.Model):
     """Base Content model for all content types"""
     
@@ -225,6 +271,10 @@ class Content(models.Model):
     visibility = models.CharField(max_length=10, choices=VISIBILITY_CHOICES)
     content_source = models.CharField(max_length=15, choices=SOURCE_CHOICES)
     
+    # Storage Tier (partition key when partitioning is enabled)
+    is_archived = models.BooleanField(default=False, editable=False)
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
     # Taxonomy Fields
     intelligence_area = models.ForeignKey(
         IntelligenceArea,
@@ -254,6 +304,8 @@ class Content(models.Model):
     data_creazione = models.DateTimeField(auto_now_add=True)
     ultima_modifica = models.DateTimeField(auto_now=True)
     
+    objects = ContentQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Content"
         verbose_name_plural = "Contents"
@@ -276,6 +328,12 @@ class Content(models.Model):
     
     def save(self, *args, **kwargs):
         self.full_clean()
+        # Content that is written again is back in the working set
+        if self.is_archived:
+            self.is_archived = False
+            self.archived_at = None
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'is_archived', 'archived_at'}
         super().save(*args, **kwargs)
     
     def __str__(self):
@@ -315,7 +373,8 @@ class Index(models.Model):
         Content, 
         on_delete=models.CASCADE, 
         primary_key=True,
-        limit_choices_to={'content_type': 'index'}
+        limit_choices_to={'content_type': 'index'},
+        db_constraint=False  # Content may be partitioned, see CONTENT PARTITIONING
     )
     
     index_type = models.CharField(max_length=20, choices=INDEX_TYPES)
@@ -363,7 +422,8 @@ class Scenario(models.Model):
         Content,
         on_delete=models.CASCADE,
         primary_key=True,
-        limit_choices_to={'content_type': 'scenario'}
+        limit_choices_to={'content_type': 'scenario'},
+        db_constraint=False  # Content may be partitioned, see CONTENT PARTITIONING
     )
     
     probabilita = models.CharField(
@@ -417,7 +477,8 @@ class TrendRadar(models.Model):
         Content,
         on_delete=models.CASCADE,
         primary_key=True,
-        limit_choices_to={'content_type': 'trend_radar'}
+        limit_choices_to={'content_type': 'trend_radar'},
+        db_constraint=False  # Content may be partitioned, see CONTENT PARTITIONING
     )
     
     # Time Reference
@@ -473,7 +534,8 @@ class ParticipatoryData(models.Model):
         Content,
         on_delete=models.CASCADE,
         primary_key=True,
-        limit_choices_to={'content_type': 'participatory_data'}
+        limit_choices_to={'content_type': 'participatory_data'},
+        db_constraint=False  # Content may be partitioned, see CONTENT PARTITIONING
     )
     
     collection_date = models.DateField(
@@ -590,7 +652,8 @@ class ContentBlock(models.Model):
     content = models.ForeignKey(
         Content,
         on_delete=models.CASCADE,
-        related_name='contentblocks'
+        related_name='contentblocks',
+        db_constraint=False  # Content may be partitioned, see CONTENT PARTITIONING
     )
     position = models.PositiveIntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(4)],
@@ -623,7 +686,15 @@ class ContentBlock(models.Model):
         ]
     
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Active ContentBlocks only show hot content
+            restore = self.is_active and self.content.is_archived
+            if restore:
+                Content.objects.filter(pk=self.content_id).restore()
+            super().save(*args, **kwargs)
+        if restore:
+            self.content.is_archived = False
+            self.content.archived_at = None
         # Update project state after ContentBlock changes
         self.project.update_state()
     
@@ -636,6 +707,116 @@ class ContentBlock(models.Model):
     def __str__(self):
         return f"Block {self.position}: {self.content.titolo} in {self.project.nome}"
 
+# ================================
+# CONTENT PARTITIONING
+# ================================
+
+# A partitioned table can only be referenced through a unique constraint that
+# includes the partition key. The subtype one-to-one tables and ContentBlock
+# therefore always use db_constraint=False, so the migration state does not
+# depend on whether partitioning is enabled; Django still handles cascades.
+
+def _content_partition_sql(table, suffix, bounds, cold_tablespace=None):
+    """DDL for one Content partition, sub-partitioned into hot/cold leaves"""
+    cold_storage = f' TABLESPACE {cold_tablespace}' if cold_tablespace else ''
+    return [
+        f'CREATE TABLE IF NOT EXISTS {table}_{suffix} PARTITION OF {table} '
+        f'{bounds} PARTITION BY LIST (is_archived)',
+        f'CREATE TABLE IF NOT EXISTS {table}_{suffix}_hot PARTITION OF {table}_{suffix} '
+        f'FOR VALUES IN (false)',
+        f'CREATE TABLE IF NOT EXISTS {table}_{suffix}_cold PARTITION OF {table}_{suffix} '
+        f'FOR VALUES IN (true){cold_storage}',
+    ]
+
+def content_year_partition_sql(year, config=None, model=None):
+    """DDL for the data_creazione range partition covering `year`"""
+    config = config or CONTENT_PARTITIONING or {}
+    model = model or Content
+    return _content_partition_sql(
+        model._meta.db_table,
+        f'y{year}',
+        f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')",
+        config.get('cold_tablespace'),
+    )
+
+def content_partitioning_sql(model, config, years=None):
+    """Convert the Content table into a partitioned table.
+    
+    Call it from a RunPython migration with the historical model
+    (apps.get_model), a literal config and, for the 'data_creazione'
+    strategy, an explicit range of years, so the generated DDL never depends
+    on the current models or on when the migration runs.
+    
+    Partitions are created either per content_type (LIST) or per year of
+    data_creazione (RANGE), and each one is split on is_archived into a hot
+    and a cold leaf. Postgres requires the partition keys in the primary key,
+    so it becomes (id, <key>, is_archived); UUID ids remain unique on their own.
+    
+    Both strategies also get a DEFAULT partition. A content type added to
+    CONTENT_TYPES later lands there until a migration gives it its own
+    partition, which must happen before rows of that type exist.
+    """
+    strategy = config.get('strategy')
+    if strategy not in CONTENT_PARTITION_STRATEGIES:
+        raise ValueError(f'Partition strategy must be one of {CONTENT_PARTITION_STRATEGIES}')
+    if strategy == 'data_creazione' and not years:
+        raise ValueError("The 'data_creazione' strategy requires an explicit range of years")
+    
+    opts = model._meta
+    table = opts.db_table
+    old_table = f'{table}_unpartitioned'
+    method = 'LIST' if strategy == 'content_type' else 'RANGE'
+    
+    statements = [
+        f'ALTER TABLE {table} RENAME TO {old_table}',
+        f'CREATE TABLE {table} (LIKE {old_table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY {method} ({strategy})',
+    ]
+    
+    if strategy == 'content_type':
+        for content_type, _ in opts.get_field('content_type').choices:
+            statements += _content_partition_sql(
+                table, content_type, f"FOR VALUES IN ('{content_type}')",
+                config.get('cold_tablespace'),
+            )
+    else:
+        for year in years:
+            statements += content_year_partition_sql(year, config, model)
+    # Catches content types or years added after this migration
+    statements += _content_partition_sql(
+        table, 'default', 'DEFAULT', config.get('cold_tablespace'),
+    )
+    
+    # Plain DROP: anything still depending on the old table must fail loudly
+    statements += [
+        f'INSERT INTO {table} SELECT * FROM {old_table}',
+        f'DROP TABLE {old_table}',
+        f'ALTER TABLE {table} ADD PRIMARY KEY (id, {strategy}, is_archived)',
+    ]
+    
+    # Indexes on the parent table propagate to every partition
+    for field in opts.concrete_fields:
+        if field.db_index and not field.primary_key:
+            statements.append(
+                f'CREATE INDEX {table}_{field.column}_idx ON {table} ({field.column})'
+            )
+    for index in opts.indexes:
+        columns = ', '.join(opts.get_field(name).column for name in index.fields)
+        statements.append(f'CREATE INDEX {index.name} ON {table} ({columns})')
+    
+    # Foreign keys last, validated in one pass over the copied rows with no
+    # deferred trigger events left pending in the migration transaction
+    for field in opts.concrete_fields:
+        if field.is_relation:
+            target = field.target_field
+            statements.append(
+                f'ALTER TABLE {table} ADD FOREIGN KEY ({field.column}) '
+                f'REFERENCES {target.model._meta.db_table} ({target.column}) '
+                f'DEFERRABLE INITIALLY DEFERRED'
+            )
+    
+    return statements
+
 # ================================
 # DJANGO ADMIN CONFIGURATION
 # ================================
@@ -651,9 +832,15 @@ class IntelligenceAreaAdmin(admin.ModelAdmin):
 @admin.register(Content)
 class ContentAdmin(admin.ModelAdmin):
     list_display = ['titolo', 'content_type', 'creator', 'visibility', 'intelligence_area', 'ultima_modifica']
-    list_filter = ['content_type', 'visibility', 'intelligence_area', 'content_source']
+    list_filter = ['content_type', 'visibility', 'intelligence_area', 'content_source', 'is_archived']
     search_fields = ['titolo', 'descrizione_breve']
-    readonly_fields = ['data_creazione', 'ultima_modifica']
+    readonly_fields = ['data_creazione', 'ultima_modifica', 'is_archived', 'archived_at']
+    actions = ['restore_content']
+    
+    @admin.action(description="Restore selected content from cold storage")
+    def restore_content(self, request, queryset):
+        restored = queryset.restore()
+        self.message_user(request, f"Restored {restored} content item(s)")
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):